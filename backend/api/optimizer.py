@@ -1,7 +1,7 @@
 import pandas as pd
 from ortools.sat.python import cp_model
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
 
 # --- Configuration Class ---
 @dataclass
@@ -11,6 +11,10 @@ class InductionPlannerConfig:
     required_service_fleet: int = 8  # Default, will be overridden by API call
     min_standby_fleet: int = 3
 
+    # Certificate validity window (the expiry rule is skipped when no window is given)
+    service_window_start: Optional[pd.Timestamp] = None
+    certificate_expiry_buffer_hours: int = 24
+
     # Resource capacity constraints
     max_maintenance_trains: int = 4
     max_cleaning_trains: int = 7
@@ -21,6 +25,107 @@ class InductionPlannerConfig:
     w_mileage: int = 10
     w_shunting: int = 5
 
+# --- Safety Rules Engine ---
+CERTIFICATE_TYPES = ('Rolling-Stock', 'Signalling', 'Telecom')
+
+@dataclass(frozen=True)
+class SafetyRule:
+    """A fleet-wide rule; lockout rules bar matching trains from service and standby."""
+    name: str
+    justification: str  # Formatted with the active config, e.g. '{config.min_standby_fleet}'
+    mask: Callable[[pd.DataFrame, InductionPlannerConfig], pd.Series]
+    lockout: bool = True  # Advisory rules only mark trains as not service-ready
+
+@dataclass
+class RuleEvaluation:
+    """Boolean masks (one column per rule) over the fleet, shared by model, explainer and analytics."""
+    masks: pd.DataFrame
+    justifications: Dict[str, str]
+    lockout_rules: List[str]
+
+    @property
+    def locked_out(self) -> pd.Series:
+        return self.masks[self.lockout_rules].any(axis=1)
+
+    @property
+    def service_ready(self) -> pd.Series:
+        return ~self.masks.any(axis=1)
+
+    @property
+    def reasons(self) -> pd.Series:
+        """Justification of the first triggered lockout rule per train, NaN for trains not locked out."""
+        # Advisory rules never constrain the model, so they must not explain its decisions
+        if not self.lockout_rules:
+            return pd.Series(None, index=self.masks.index, dtype=object)
+        first_rule = self.masks[self.lockout_rules].idxmax(axis=1).map(self.justifications)
+        return first_rule.where(self.locked_out)
+
+class SafetyRulesEngine:
+    """Evaluates all safety rules as vectorized masks over the whole fleet in one pass."""
+    def __init__(self, rules: List[SafetyRule]):
+        # Rule order sets the precedence of justifications when several rules fire
+        self.rules = rules
+
+    def evaluate(self, master_data: pd.DataFrame, config: InductionPlannerConfig) -> RuleEvaluation:
+        masks = pd.DataFrame(
+            {rule.name: rule.mask(master_data, config).astype(bool) for rule in self.rules},
+            index=master_data.index,
+        )
+        justifications = {rule.name: rule.justification.format(config=config) for rule in self.rules}
+        lockout_rules = [rule.name for rule in self.rules if rule.lockout]
+        return RuleEvaluation(masks, justifications, lockout_rules)
+
+def _critical_job_card(df: pd.DataFrame, config: InductionPlannerConfig) -> pd.Series:
+    return df['Highest_Open_Job_Priority'] == 'Critical'
+
+def _expired_certificate(df: pd.DataFrame, config: InductionPlannerConfig) -> pd.Series:
+    statuses = df[[f"{cert}_Status" for cert in CERTIFICATE_TYPES]]
+    return (statuses == 'Expired').any(axis=1)
+
+def _certificate_status_expiring(df: pd.DataFrame, config: InductionPlannerConfig) -> pd.Series:
+    statuses = df[[f"{cert}_Status" for cert in CERTIFICATE_TYPES]]
+    return (statuses == 'Expiring').any(axis=1)
+
+def _certificate_expiring_in_window(df: pd.DataFrame, config: InductionPlannerConfig) -> pd.Series:
+    if config.service_window_start is None:
+        return pd.Series(False, index=df.index)
+    cutoff = pd.Timestamp(config.service_window_start) + pd.Timedelta(hours=config.certificate_expiry_buffer_hours)
+    expiries = df[[f"{cert}_Expiry" for cert in CERTIFICATE_TYPES]].apply(pd.to_datetime, errors='coerce')
+    return (expiries < cutoff).any(axis=1)
+
+def _mileage_over_threshold(df: pd.DataFrame, config: InductionPlannerConfig) -> pd.Series:
+    return df['Kilometers_Since_Last_Maintenance'] > df['Maintenance_Threshold']
+
+SAFETY_RULES = SafetyRulesEngine([
+    SafetyRule(
+        'critical_job_card',
+        "Barred from service and standby due to a 'Critical' open job card.",
+        _critical_job_card,
+    ),
+    SafetyRule(
+        'expired_certificate',
+        "Barred from service and standby due to an expired fitness certificate.",
+        _expired_certificate,
+    ),
+    SafetyRule(
+        'certificate_expiring',
+        "Barred from service and standby as a fitness certificate expires within "
+        "{config.certificate_expiry_buffer_hours} hours of the service window.",
+        _certificate_expiring_in_window,
+    ),
+    SafetyRule(
+        'mileage_over_threshold',
+        "Barred from service and standby as mileage since last maintenance exceeds its threshold.",
+        _mileage_over_threshold,
+    ),
+    SafetyRule(
+        'certificate_status_expiring',
+        "Not service-ready as a fitness certificate is nearing expiry.",
+        _certificate_status_expiring,
+        lockout=False,
+    ),
+])
+
 # --- Optimization Model Class ---
 class InductionDecisionModel:
     """Encapsulates the entire optimization model logic."""
@@ -33,6 +138,7 @@ class InductionDecisionModel:
         self.trains = self.df.index.tolist()
         self.decisions: Dict[str, Any] = {}
         self.status = None
+        self.rule_evaluation = SAFETY_RULES.evaluate(self.df, self.config)
 
     def _create_decision_variables(self):
         """Creates boolean variables for each possible train assignment."""
@@ -59,23 +165,16 @@ class InductionDecisionModel:
         self.model.Add(num_maint <= self.config.max_maintenance_trains)
         self.model.Add(num_clean <= self.config.max_cleaning_trains)
 
-        for train_id in self.trains:
-            train_data = self.df.loc[train_id]
-            d = self.decisions[train_id]
-            
-            # 3. State exclusivity: A train can only be in one state
+        # 3. State exclusivity: A train can only be in one state
+        for d in self.decisions.values():
             self.model.Add(sum(d.values()) == 1)
 
-            # 4. Safety lockouts
-            is_unsafe = (
-                train_data['Rolling-Stock_Status'] == 'Expired' or
-                train_data['Signalling_Status'] == 'Expired' or
-                train_data['Telecom_Status'] == 'Expired' or
-                train_data['Highest_Open_Job_Priority'] == 'Critical'
-            )
-            if is_unsafe:
-                self.model.Add(d['is_in_service'] == 0)
-                self.model.Add(d['is_on_standby'] == 0)
+        # 4. Safety lockouts (masks precomputed by the rules engine)
+        locked_out = self.rule_evaluation.locked_out
+        for train_id in locked_out.index[locked_out]:
+            d = self.decisions[train_id]
+            self.model.Add(d['is_in_service'] == 0)
+            self.model.Add(d['is_on_standby'] == 0)
 
     def _define_objective_function(self):
         """Defines the weighted objective to be maximized."""
@@ -117,13 +216,16 @@ class InductionDecisionModel:
 # --- Explainability Layer Class ---
 class SolutionAnalyzer:
     """Analyzes the solver's output and generates human-readable justifications."""
-    def __init__(self, master_data, decisions, solver):
+    def __init__(self, master_data, decisions, solver, rule_evaluation: RuleEvaluation):
         self.df = master_data
         self.decisions = decisions
         self.solver = solver
+        # Must be the model's own evaluation so justifications match the applied constraints
+        self.rule_evaluation = rule_evaluation
 
     def generate_plan_with_justifications(self) -> List[Dict[str, Any]]:
         plan = []
+        rule_reasons = self.rule_evaluation.reasons
         for train_id, decision_vars in self.decisions.items():
             train_data = self.df.loc[train_id]
             assigned_status = "UNKNOWN"
@@ -144,10 +246,8 @@ class SolutionAnalyzer:
 
             elif self.solver.Value(decision_vars['is_in_maintenance']):
                 assigned_status = "MAINTENANCE"
-                if train_data['Highest_Open_Job_Priority'] == 'Critical':
-                    justification = f"Mandatory maintenance due to a 'Critical' open job card."
-                elif train_data['Rolling-Stock_Status'] == 'Expired' or train_data['Signalling_Status'] == 'Expired' or train_data['Telecom_Status'] == 'Expired':
-                    justification = f"Mandatory maintenance due to an expired fitness certificate."
+                if pd.notna(rule_reasons[train_id]):
+                    justification = rule_reasons[train_id]
                 else:
                     justification = "Assigned to maintenance based on model's cost-benefit analysis."
 
@@ -157,6 +257,9 @@ class SolutionAnalyzer:
                     justification = f"Prioritized for cleaning as it is {train_data['Days_Since_Last_Clean'] - 15} day(s) overdue for its 15-day deep clean."
                 else:
                     justification = "Assigned to a cleaning slot to maintain schedule."
+                # Locked-out trains may be cleaned instead of maintained; keep the lockout visible
+                if pd.notna(rule_reasons[train_id]):
+                    justification = f"{rule_reasons[train_id]} {justification}"
 
             plan.append({
                 'TrainSet_ID': train_id,
@@ -0,0 +1,166 @@
+import pandas as pd
+from django.test import SimpleTestCase
+from ortools.sat.python import cp_model
+
+from api.optimizer import InductionDecisionModel, InductionPlannerConfig, SAFETY_RULES, SolutionAnalyzer
+from api.views import generate_analytics_data, parse_service_window_start
+
+
+def make_fleet(overrides=None):
+    """Builds a small fleet of healthy trains, with column overrides keyed by train ID."""
+    rows = {}
+    for train_id in ['TS-OK', 'TS-CRIT', 'TS-EXP', 'TS-WIN', 'TS-KM', 'TS-SOON', 'TS-MULTI', 'TS-NAT']:
+        rows[train_id] = {
+            'Rolling-Stock_Status': 'Valid',
+            'Signalling_Status': 'Valid',
+            'Telecom_Status': 'Valid',
+            'Highest_Open_Job_Priority': 'None',
+            'Kilometers_Since_Last_Maintenance': 1000,
+            'Maintenance_Threshold': 5000,
+            'Rolling-Stock_Expiry': '2026-01-01',
+            'Signalling_Expiry': '2026-01-01',
+            'Telecom_Expiry': '2026-01-01',
+            'Penalty_Risk_Level': 'None',
+            'Compliance_Status': 'Compliant',
+            'Days_Since_Last_Clean': 3,
+            'Urgency_Level': 'Low',
+            'Estimated_Shunting_Time_Minutes': 0,
+        }
+    for train_id, columns in (overrides or {}).items():
+        rows[train_id].update(columns)
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+# One train per rule, one tripping several lockouts and one with unparseable expiries
+RULE_OVERRIDES = {
+    'TS-CRIT': {'Highest_Open_Job_Priority': 'Critical'},
+    'TS-EXP': {'Signalling_Status': 'Expired'},
+    'TS-WIN': {'Telecom_Expiry': '2025-10-01'},
+    'TS-KM': {'Kilometers_Since_Last_Maintenance': 5001},
+    'TS-SOON': {'Rolling-Stock_Status': 'Expiring'},
+    'TS-MULTI': {'Telecom_Status': 'Expired', 'Highest_Open_Job_Priority': 'Critical',
+                 'Kilometers_Since_Last_Maintenance': 9000},
+    'TS-NAT': {'Rolling-Stock_Expiry': None, 'Signalling_Expiry': 'not a date'},
+}
+
+
+class SafetyRulesEngineTests(SimpleTestCase):
+    def setUp(self):
+        self.df = make_fleet(RULE_OVERRIDES)
+        self.config = InductionPlannerConfig(service_window_start=pd.Timestamp('2025-09-30T12:00'))
+
+    def test_each_rule_flags_expected_trains(self):
+        masks = SAFETY_RULES.evaluate(self.df, self.config).masks
+        expected = {
+            'critical_job_card': {'TS-CRIT', 'TS-MULTI'},
+            'expired_certificate': {'TS-EXP', 'TS-MULTI'},
+            'certificate_expiring': {'TS-WIN'},
+            'mileage_over_threshold': {'TS-KM', 'TS-MULTI'},
+            'certificate_status_expiring': {'TS-SOON'},
+        }
+        for rule, trains in expected.items():
+            self.assertEqual(set(masks.index[masks[rule]]), trains, rule)
+
+    def test_mileage_at_threshold_is_not_flagged(self):
+        df = make_fleet({'TS-KM': {'Kilometers_Since_Last_Maintenance': 5000}})
+        masks = SAFETY_RULES.evaluate(df, self.config).masks
+        self.assertFalse(masks.loc['TS-KM', 'mileage_over_threshold'])
+
+    def test_first_rule_in_order_gives_the_reason(self):
+        reasons = SAFETY_RULES.evaluate(self.df, self.config).reasons
+        self.assertEqual(reasons['TS-MULTI'], "Barred from service and standby due to a 'Critical' open job card.")
+        self.assertIn('24 hours', reasons['TS-WIN'])
+        self.assertTrue(pd.isna(reasons['TS-OK']))
+        self.assertTrue(pd.isna(reasons['TS-SOON']))
+
+    def test_window_rule_is_off_without_a_window(self):
+        evaluation = SAFETY_RULES.evaluate(self.df, InductionPlannerConfig())
+        self.assertFalse(evaluation.masks['certificate_expiring'].any())
+        self.assertFalse(evaluation.locked_out['TS-WIN'])
+
+    def test_buffer_extends_the_window(self):
+        config = InductionPlannerConfig(service_window_start=pd.Timestamp('2025-09-29'),
+                                        certificate_expiry_buffer_hours=12)
+        self.assertFalse(SAFETY_RULES.evaluate(self.df, config).masks.loc['TS-WIN', 'certificate_expiring'])
+        config.certificate_expiry_buffer_hours = 72
+        self.assertTrue(SAFETY_RULES.evaluate(self.df, config).masks.loc['TS-WIN', 'certificate_expiring'])
+
+    def test_unparseable_expiry_does_not_trigger_window_rule(self):
+        evaluation = SAFETY_RULES.evaluate(self.df, self.config)
+        self.assertFalse(evaluation.masks.loc['TS-NAT'].any())
+        self.assertTrue(evaluation.service_ready['TS-NAT'])
+
+    def test_advisory_rule_is_not_a_lockout(self):
+        evaluation = SAFETY_RULES.evaluate(self.df, self.config)
+        self.assertFalse(evaluation.locked_out['TS-SOON'])
+        self.assertFalse(evaluation.service_ready['TS-SOON'])
+        self.assertEqual(
+            set(evaluation.locked_out.index[evaluation.locked_out]),
+            {'TS-CRIT', 'TS-EXP', 'TS-WIN', 'TS-KM', 'TS-MULTI'},
+        )
+        self.assertEqual(set(evaluation.service_ready.index[evaluation.service_ready]), {'TS-OK', 'TS-NAT'})
+
+
+class RuleConsumerTests(SimpleTestCase):
+    def setUp(self):
+        self.df = make_fleet(RULE_OVERRIDES)
+
+    def solve(self, **config):
+        model = InductionDecisionModel(self.df, InductionPlannerConfig(**config))
+        model.solve()
+        plan = SolutionAnalyzer(self.df, model.decisions, model.solver, model.rule_evaluation)
+        return model, {item['TrainSet_ID']: item for item in plan.generate_plan_with_justifications()}
+
+    def test_model_bars_locked_out_trains_but_not_advisory_ones(self):
+        # Only the four unlocked trains can fill a four-train service fleet
+        model, plan = self.solve(required_service_fleet=4, min_standby_fleet=0)
+        self.assertEqual(model.status, cp_model.OPTIMAL)
+        in_service = {train_id for train_id, item in plan.items() if item['Assigned_Status'] == 'SERVICE'}
+        self.assertEqual(in_service, {'TS-OK', 'TS-WIN', 'TS-SOON', 'TS-NAT'})
+        for train_id in ['TS-CRIT', 'TS-EXP', 'TS-KM', 'TS-MULTI']:
+            self.assertIn(plan[train_id]['Assigned_Status'], ['MAINTENANCE', 'CLEANING'])
+
+    def test_analyzer_uses_the_model_rule_evaluation(self):
+        # The window rule only fires under the model's config, not a default one
+        model, plan = self.solve(required_service_fleet=3, min_standby_fleet=0, max_maintenance_trains=5,
+                                 max_cleaning_trains=0, service_window_start=pd.Timestamp('2025-09-30T12:00'))
+        self.assertEqual(model.status, cp_model.OPTIMAL)
+        self.assertEqual(plan['TS-WIN']['Assigned_Status'], 'MAINTENANCE')
+        self.assertEqual(plan['TS-WIN']['Justification'], model.rule_evaluation.reasons['TS-WIN'])
+
+    def test_locked_out_train_in_cleaning_keeps_its_reason(self):
+        model, plan = self.solve(required_service_fleet=4, min_standby_fleet=0, max_maintenance_trains=0)
+        self.assertEqual(plan['TS-KM']['Assigned_Status'], 'CLEANING')
+        self.assertTrue(plan['TS-KM']['Justification'].startswith(model.rule_evaluation.reasons['TS-KM']))
+
+    def test_analytics_service_ready_matches_rule_evaluation(self):
+        model, plan = self.solve(required_service_fleet=4, min_standby_fleet=0)
+        analytics = generate_analytics_data(self.df, list(plan.values()), model.rule_evaluation)
+        self.assertEqual(analytics['fleetHealth']['serviceReady'], model.rule_evaluation.service_ready.sum())
+        self.assertEqual(analytics['fleetHealth']['serviceReady'], 3)
+
+
+class GeneratePlanViewTests(SimpleTestCase):
+    def test_invalid_service_window_start_returns_400(self):
+        for value in [5, 'not a date']:
+            response = self.client.post('/api/generate-plan/', {'service_window_start': value},
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400, value)
+
+
+class ParseServiceWindowStartTests(SimpleTestCase):
+    def test_timezone_aware_input_becomes_naive(self):
+        timestamp = parse_service_window_start('2025-10-01T06:00Z')
+        self.assertIsNone(timestamp.tzinfo)
+        self.assertEqual(timestamp, pd.Timestamp('2025-10-01T06:00'))
+
+    def test_missing_value_disables_window(self):
+        self.assertIsNone(parse_service_window_start(None))
+        self.assertIsNone(parse_service_window_start(''))
+
+    def test_invalid_values_are_rejected(self):
+        with self.assertRaises(TypeError):
+            parse_service_window_start(5)
+        for value in ['NaT', 'not a date']:
+            with self.assertRaises(ValueError):
+                parse_service_window_start(value)
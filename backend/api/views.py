@@ -37,16 +37,26 @@ def load_master_data():
 
 import numpy as np
 
-def generate_analytics_data(master_data, plan):
+def parse_service_window_start(value):
+    """Parses the optional service window start into a tz-naive timestamp in the project time zone."""
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str):
+        raise TypeError(f"service_window_start must be a datetime string, got {type(value).__name__}")
+    timestamp = pd.Timestamp(value)
+    if pd.isna(timestamp):
+        raise ValueError(f"service_window_start is not a valid datetime: {value!r}")
+    # Expiry dates in the data are tz-naive, so aware inputs (e.g. JS toISOString()) must be made naive
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(settings.TIME_ZONE).tz_localize(None)
+    return timestamp
+
+def generate_analytics_data(master_data, plan, rule_evaluation):
     """Generate analytics data for the frontend dashboard."""
     try:
-        # Calculate fleet health metrics
+        # Calculate fleet health metrics (service ready = not flagged by any safety rule)
         total_trains = len(master_data)
-        service_ready = len(master_data[
-            (master_data['Rolling-Stock_Status'] == 'Valid') & 
-            (master_data['Signalling_Status'] == 'Valid') & 
-            (master_data['Telecom_Status'] == 'Valid')
-        ])
+        service_ready = rule_evaluation.service_ready.sum()
         
         critical_issues = len(master_data[master_data['Urgency_Level'] == 'Critical'])
         maintenance_due = len(master_data[master_data['Urgency_Level'] == 'High'])
@@ -155,6 +165,8 @@ class GeneratePlanView(APIView):
             config = InductionPlannerConfig(
                 required_service_fleet=int(data.get('required_service_fleet', 8)),
                 min_standby_fleet=int(data.get('min_standby_fleet', 3)),
+                service_window_start=parse_service_window_start(data.get('service_window_start')),
+                certificate_expiry_buffer_hours=int(data.get('certificate_expiry_buffer_hours', 24)),
                 max_maintenance_trains=int(data.get('max_maintenance_trains', 4)),
                 max_cleaning_trains=int(data.get('max_cleaning_trains', 7)),
                 w_sla=int(data.get('w_sla', 50)),
@@ -165,7 +177,7 @@ class GeneratePlanView(APIView):
         except (ValueError, TypeError) as e:
             logging.warning(f"GeneratePlanView: Invalid parameter type: {e}")
             return Response(
-                {"error": "Invalid parameter type. All configuration values must be integers."},
+                {"error": "Invalid parameter type. Configuration values must be integers and 'service_window_start' a valid datetime."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
@@ -187,11 +199,11 @@ class GeneratePlanView(APIView):
             alerts.append("Optimization found a feasible solution, but it's not optimal. Consider adjusting parameters.")
 
         if solver_status == cp_model.OPTIMAL or solver_status == cp_model.FEASIBLE:
-            analyzer = SolutionAnalyzer(master_data, model.decisions, model.solver)
+            analyzer = SolutionAnalyzer(master_data, model.decisions, model.solver, model.rule_evaluation)
             final_plan = analyzer.generate_plan_with_justifications()
             
             # Generate analytics data
-            analytics = generate_analytics_data(master_data, final_plan)
+            analytics = generate_analytics_data(master_data, final_plan, model.rule_evaluation)
             
             logging.info("GeneratePlanView: Optimization successful, sending plan.")
             return Response({